@@ -3,7 +3,10 @@ from flask_sqlalchemy import SQLAlchemy
 from flask_login import LoginManager, UserMixin, login_user, login_required, logout_user, current_user
 from werkzeug.security import generate_password_hash, check_password_hash
 from werkzeug.utils import secure_filename
-from datetime import datetime, timedelta
+from werkzeug.middleware.proxy_fix import ProxyFix
+from werkzeug.wrappers import Request as WSGIRequest, Response as WSGIResponse
+from werkzeug.utils import send_file as wsgi_send_file
+from datetime import date, datetime, timedelta
 import os
 import json
 from PIL import Image
@@ -13,6 +16,32 @@ from email.mime.text import MIMEText
 from email.mime.multipart import MIMEMultipart
 import smtplib
 import uuid
+import gzip
+import hashlib
+import mimetypes
+import re
+import math
+import threading
+import time
+from functools import wraps
+from collections import OrderedDict
+import click
+from jinja2 import FileSystemBytecodeCache, nodes
+from jinja2.ext import Extension
+from sqlalchemy.dialects.postgresql import insert as postgresql_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.orm import object_session
+from sqlalchemy.schema import CreateColumn
+try:
+    import brotli
+    BROTLI_AVAILABLE = True
+except ImportError:
+    BROTLI_AVAILABLE = False
+try:
+    import redis
+    REDIS_AVAILABLE = True
+except ImportError:
+    REDIS_AVAILABLE = False
 try:
     import weasyprint
     from weasyprint import HTML, CSS
@@ -32,6 +61,16 @@ app.config['SQLALCHEMY_DATABASE_URI'] = os.environ.get('DATABASE_URL', 'sqlite:/
 app.config['SQLALCHEMY_TRACK_MODIFICATIONS'] = False
 app.config['UPLOAD_FOLDER'] = 'uploads'
 app.config['MAX_CONTENT_LENGTH'] = 16 * 1024 * 1024  # 16MB max file size
+app.config['JINJA_CACHE_DIR'] = os.environ.get('JINJA_CACHE_DIR', os.path.join(app.instance_path, 'jinja_cache'))
+app.config['FRAGMENT_CACHE_SIZE'] = int(os.environ.get('FRAGMENT_CACHE_SIZE', 2048))
+
+# Render and Heroku each put one proxy in front of the app; trust that many
+# X-Forwarded-For/-Proto hops so request.remote_addr is the real client.
+# Set TRUSTED_PROXY_COUNT=0 when the app is reached directly.
+app.config['TRUSTED_PROXY_COUNT'] = int(os.environ.get('TRUSTED_PROXY_COUNT', 1))
+if app.config['TRUSTED_PROXY_COUNT']:
+    app.wsgi_app = ProxyFix(app.wsgi_app, x_for=app.config['TRUSTED_PROXY_COUNT'],
+                            x_proto=app.config['TRUSTED_PROXY_COUNT'])
 
 # Set Flask environment
 if os.environ.get('FLASK_ENV') == 'production':
@@ -44,10 +83,194 @@ os.makedirs(app.config['UPLOAD_FOLDER'], exist_ok=True)
 
 db = SQLAlchemy(app)
 
+# Template caching
+# Compiled template bytecode is kept on disk so workers skip compilation at boot,
+# and {% cache key, ttl %} blocks keep rendered fragments in process memory.
+class FragmentCache:
+    def __init__(self, maxsize):
+        self.maxsize = maxsize
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            value, expires_at = entry
+            if expires_at is not None and expires_at < time.monotonic():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return value
+
+    def set(self, key, value, ttl=None):
+        expires_at = time.monotonic() + ttl if ttl else None
+        with self._lock:
+            self._entries[key] = (value, expires_at)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+fragment_cache = FragmentCache(app.config['FRAGMENT_CACHE_SIZE'])
+
+class FragmentCacheExtension(Extension):
+    """Adds {% cache key, ttl %}...{% endcache %}; ttl is in seconds and optional."""
+    tags = {'cache'}
+
+    def parse(self, parser):
+        lineno = next(parser.stream).lineno
+        key = parser.parse_expression()
+        ttl = parser.parse_expression() if parser.stream.skip_if('comma') else nodes.Const(None)
+        body = parser.parse_statements(('name:endcache',), drop_needle=True)
+        return nodes.CallBlock(self.call_method('_render_fragment', [key, ttl]),
+                               [], [], body).set_lineno(lineno)
+
+    def _render_fragment(self, key, ttl, caller):
+        fragment = fragment_cache.get(key)
+        if fragment is None:
+            fragment = caller()
+            fragment_cache.set(key, fragment, ttl)
+        return fragment
+
+os.makedirs(app.config['JINJA_CACHE_DIR'], exist_ok=True)
+app.jinja_env.bytecode_cache = FileSystemBytecodeCache(app.config['JINJA_CACHE_DIR'])
+app.jinja_env.add_extension(FragmentCacheExtension)
+
 # Context processor to provide 'now' variable to all templates
 @app.context_processor
 def inject_now():
     return {'now': datetime.utcnow()}
+
+# Static asset pipeline
+# `flask assets build` minifies and fingerprints the files in ASSET_SOURCES and
+# writes gzip/brotli variants next to them, so /assets/ never compresses at runtime.
+ASSET_SOURCES = ['css/custom.css', 'js/main.js']
+ASSET_DIST_FOLDER = os.path.join(app.static_folder, 'dist')
+ASSET_MANIFEST_PATH = os.path.join(ASSET_DIST_FOLDER, 'manifest.json')
+ASSET_MAX_AGE = 365 * 24 * 60 * 60  # one year, safe because names change with content
+ASSET_URL_PREFIX = '/assets/'
+_asset_manifest = None
+
+def minify_css(source):
+    source = re.sub(r'/\*.*?\*/', '', source, flags=re.S)
+    source = re.sub(r'\s+', ' ', source)
+    source = re.sub(r'\s*([{};:,>])\s*', r'\1', source)
+    return source.replace(';}', '}').strip()
+
+def minify_js(source):
+    # Conservative: drop indentation, blank lines and whole-line comments but keep
+    # line breaks so automatic semicolon insertion behaves exactly as before.
+    lines = []
+    for line in source.splitlines():
+        line = line.strip()
+        if line and not line.startswith('//'):
+            lines.append(line)
+    return '\n'.join(lines) + '\n'
+
+ASSET_MINIFIERS = {'.css': minify_css, '.js': minify_js}
+
+def build_assets():
+    manifest = {}
+    for logical_name in ASSET_SOURCES:
+        root, ext = os.path.splitext(logical_name)
+        with open(os.path.join(app.static_folder, logical_name), encoding='utf-8') as f:
+            content = ASSET_MINIFIERS[ext](f.read()).encode('utf-8')
+        fingerprint = hashlib.sha256(content).hexdigest()[:12]
+        hashed_name = f'{root}.{fingerprint}{ext}'
+        output_path = os.path.join(ASSET_DIST_FOLDER, hashed_name)
+        os.makedirs(os.path.dirname(output_path), exist_ok=True)
+
+        with open(output_path, 'wb') as f:
+            f.write(content)
+        with open(output_path + '.gz', 'wb') as f:
+            f.write(gzip.compress(content, compresslevel=9, mtime=0))
+        if BROTLI_AVAILABLE:
+            with open(output_path + '.br', 'wb') as f:
+                f.write(brotli.compress(content, quality=11))
+
+        manifest[logical_name] = hashed_name
+
+    with open(ASSET_MANIFEST_PATH, 'w') as f:
+        json.dump(manifest, f, indent=2, sort_keys=True)
+    return manifest
+
+def load_asset_manifest():
+    global _asset_manifest
+    if _asset_manifest is None:
+        try:
+            with open(ASSET_MANIFEST_PATH) as f:
+                _asset_manifest = json.load(f)
+        except (OSError, ValueError):
+            _asset_manifest = {}
+    return _asset_manifest
+
+@app.template_global()
+def asset_url(filename):
+    hashed_name = load_asset_manifest().get(filename)
+    if hashed_name is None:
+        # No build output (e.g. local development): fall back to the raw file
+        return url_for('static', filename=filename)
+    return f'{request.script_root}{ASSET_URL_PREFIX}{hashed_name}'
+
+@app.cli.group('assets')
+def assets_cli():
+    """Static asset pipeline commands."""
+
+@assets_cli.command('build')
+def assets_build_command():
+    """Minify, fingerprint and precompress static assets."""
+    manifest = build_assets()
+    for logical_name, hashed_name in sorted(manifest.items()):
+        click.echo(f'{logical_name} -> dist/{hashed_name}')
+    if not BROTLI_AVAILABLE:
+        click.echo('Warning: brotli not installed, only gzip variants were written.')
+
+class PrecompressedAssetMiddleware:
+    """Serve built assets in front of Flask.
+
+    Requests under ASSET_URL_PREFIX never reach the Flask app, so no session or
+    Flask-Login hook can add Set-Cookie or Vary: Cookie to a cacheable response.
+    """
+
+    def __init__(self, wsgi_app):
+        self.wsgi_app = wsgi_app
+
+    def __call__(self, environ, start_response):
+        path = environ.get('PATH_INFO', '')
+        if not path.startswith(ASSET_URL_PREFIX):
+            return self.wsgi_app(environ, start_response)
+        return self.serve(WSGIRequest(environ), path[len(ASSET_URL_PREFIX):])(environ, start_response)
+
+    def serve(self, request, filename):
+        if filename not in load_asset_manifest().values():
+            return WSGIResponse('Not Found', status=404, mimetype='text/plain')
+
+        # Pick the smallest precompressed variant the client accepts
+        variants = {'identity': ''}
+        base_path = os.path.join(ASSET_DIST_FOLDER, filename)
+        for encoding, suffix in (('br', '.br'), ('gzip', '.gz')):
+            if os.path.exists(base_path + suffix):
+                variants[encoding] = suffix
+        encoding = request.accept_encodings.best_match(
+            [e for e in ('br', 'gzip', 'identity') if e in variants], default='identity')
+
+        mimetype = mimetypes.guess_type(filename)[0] or 'application/octet-stream'
+        response = wsgi_send_file(base_path + variants[encoding], request.environ, mimetype=mimetype,
+                                  max_age=ASSET_MAX_AGE, conditional=True)
+        if encoding != 'identity':
+            response.headers['Content-Encoding'] = encoding
+        response.headers['Vary'] = 'Accept-Encoding'
+        response.cache_control.public = True
+        response.cache_control.immutable = True
+        return response
+
+app.wsgi_app = PrecompressedAssetMiddleware(app.wsgi_app)
+
 login_manager = LoginManager()
 login_manager.init_app(app)
 login_manager.login_view = 'login'
@@ -82,23 +305,44 @@ class Event(db.Model):
     current_participants = db.Column(db.Integer, default=0)
     registration_deadline = db.Column(db.DateTime)
     is_active = db.Column(db.Boolean, default=True)
+    registration_open = db.Column(db.Boolean, default=True, server_default=db.true())  # closed by the scheduler at the deadline
+    reminder_sent = db.Column(db.Boolean, default=False, server_default=db.false())
     image_url = db.Column(db.String(200))
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
     creator_id = db.Column(db.Integer, db.ForeignKey('user.id'), nullable=False)
+    version = db.Column(db.Integer, nullable=False, default=1, server_default='1')  # bumped on every update
     
     # Relationships
     registrations = db.relationship('Registration', backref='event', lazy=True)
 
+    # Indexes used by the scheduler to find due events without scanning the table
+    __table_args__ = (
+        db.Index('ix_event_active_start_date', 'is_active', 'start_date'),
+        db.Index('ix_event_active_end_date', 'is_active', 'end_date'),
+        db.Index('ix_event_open_registration_deadline', 'registration_open', 'registration_deadline'),
+    )
+
+    @property
+    def cache_key(self):
+        return f'event:{self.id}:v{self.version}'
+
 class Registration(db.Model):
     id = db.Column(db.Integer, primary_key=True)
     user_id = db.Column(db.Integer, db.ForeignKey('user.id'), nullable=False)
     event_id = db.Column(db.Integer, db.ForeignKey('event.id'), nullable=False)
     registration_date = db.Column(db.DateTime, default=datetime.utcnow)
     status = db.Column(db.String(20), default='registered')  # registered, attended, cancelled
-    attendance_confirmed = db.Column(db.Boolean, default=False)
-    certificate_issued = db.Column(db.Boolean, default=False)
+    # active_history loads the previous value on assignment so the analytics
+    # rollups only count real transitions
+    attendance_confirmed = db.column_property(db.Column(db.Boolean, default=False), active_history=True)
+    certificate_issued = db.column_property(db.Column(db.Boolean, default=False), active_history=True)
     certificate_url = db.Column(db.String(200))
 
+    __table_args__ = (
+        db.Index('ix_registration_user_id', 'user_id'),
+        db.Index('ix_registration_event_id', 'event_id'),
+    )
+
 class Notification(db.Model):
     id = db.Column(db.Integer, primary_key=True)
     user_id = db.Column(db.Integer, db.ForeignKey('user.id'), nullable=False)
@@ -106,12 +350,538 @@ class Notification(db.Model):
     message = db.Column(db.Text, nullable=False)
     is_read = db.Column(db.Boolean, default=False)
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
-    notification_type = db.Column(db.String(50))  # event_update, registration, certificate
+    notification_type = db.Column(db.String(50))  # event_update, registration, certificate, event_reminder
+
+    __table_args__ = (
+        db.Index('ix_notification_user_created_at', 'user_id', 'created_at'),
+        db.Index('ix_notification_read_created_at', 'is_read', 'created_at'),
+    )
+
+# Archive tables keep the original primary keys so links such as certificate
+# downloads keep working after the retention job moves a row out of the hot table.
+class RegistrationArchive(db.Model):
+    id = db.Column(db.Integer, primary_key=True, autoincrement=False)
+    user_id = db.Column(db.Integer, db.ForeignKey('user.id'), nullable=False)
+    event_id = db.Column(db.Integer, db.ForeignKey('event.id'), nullable=False)
+    registration_date = db.Column(db.DateTime)
+    status = db.Column(db.String(20))
+    attendance_confirmed = db.Column(db.Boolean, default=False)
+    certificate_issued = db.Column(db.Boolean, default=False)
+    certificate_url = db.Column(db.String(200))
+    archived_at = db.Column(db.DateTime, server_default=db.func.current_timestamp())
+
+    # Relationships
+    user = db.relationship('User', backref=db.backref('archived_registrations', lazy=True))
+    event = db.relationship('Event', backref=db.backref('archived_registrations', lazy=True))
+
+    __table_args__ = (
+        db.Index('ix_registration_archive_user_id', 'user_id'),
+        db.Index('ix_registration_archive_event_id', 'event_id'),
+    )
+
+class NotificationArchive(db.Model):
+    id = db.Column(db.Integer, primary_key=True, autoincrement=False)
+    user_id = db.Column(db.Integer, db.ForeignKey('user.id'), nullable=False)
+    title = db.Column(db.String(200), nullable=False)
+    message = db.Column(db.Text, nullable=False)
+    is_read = db.Column(db.Boolean, default=True)
+    created_at = db.Column(db.DateTime)
+    notification_type = db.Column(db.String(50))
+    archived_at = db.Column(db.DateTime, server_default=db.func.current_timestamp())
+
+    __table_args__ = (
+        db.Index('ix_notification_archive_user_created_at', 'user_id', 'created_at'),
+    )
+
+# Analytics rollups, maintained incrementally by the Registration listeners below.
+# They count archived registrations too, so they describe the full history.
+class EventDailyRegistrations(db.Model):
+    event_id = db.Column(db.Integer, db.ForeignKey('event.id'), primary_key=True)
+    day = db.Column(db.Date, primary_key=True)
+    registrations = db.Column(db.Integer, nullable=False, default=0)
+
+class EventRegistrationStats(db.Model):
+    event_id = db.Column(db.Integer, db.ForeignKey('event.id'), primary_key=True)
+    registrations = db.Column(db.Integer, nullable=False, default=0)
+    attended = db.Column(db.Integer, nullable=False, default=0)
+    certificates_issued = db.Column(db.Integer, nullable=False, default=0)
+
+class SegmentConversion(db.Model):
+    dimension = db.Column(db.String(20), primary_key=True)  # event_type, department
+    value = db.Column(db.String(100), primary_key=True)
+    registrations = db.Column(db.Integer, nullable=False, default=0)
+    attended = db.Column(db.Integer, nullable=False, default=0)
+    certificates_issued = db.Column(db.Integer, nullable=False, default=0)
+
+ROLLUP_DIMENSIONS = ['event_type', 'department']
+UNSPECIFIED_DEPARTMENT = 'Unspecified'
+
+@db.event.listens_for(Event, 'before_update')
+def bump_event_version(mapper, connection, target):
+    # Cached template fragments are keyed on Event.cache_key, so any real
+    # change to the row (including participant counts) invalidates them.
+    if object_session(target).is_modified(target, include_collections=False):
+        target.version = (target.version or 0) + 1
+
+def _increment_rollup(connection, model, keys, deltas):
+    table = model.__table__
+    insert = postgresql_insert if connection.dialect.name == 'postgresql' else sqlite_insert
+    statement = insert(table).values(**keys, **deltas)
+    connection.execute(statement.on_conflict_do_update(
+        index_elements=list(keys),
+        set_={name: table.c[name] + statement.excluded[name] for name in deltas}))
+
+def _apply_registration_rollups(connection, registration, deltas, day=None):
+    event_type, department = connection.execute(db.select(
+        db.select(Event.event_type).where(Event.id == registration.event_id).scalar_subquery(),
+        db.select(User.department).where(User.id == registration.user_id).scalar_subquery()
+    )).one()
+    _increment_rollup(connection, EventRegistrationStats, {'event_id': registration.event_id}, deltas)
+    segments = {'event_type': event_type, 'department': department or UNSPECIFIED_DEPARTMENT}
+    for dimension in ROLLUP_DIMENSIONS:
+        _increment_rollup(connection, SegmentConversion,
+                          {'dimension': dimension, 'value': segments[dimension]}, deltas)
+    if day is not None:
+        _increment_rollup(connection, EventDailyRegistrations,
+                          {'event_id': registration.event_id, 'day': day}, {'registrations': 1})
+
+@db.event.listens_for(Registration, 'after_insert')
+def rollup_new_registration(mapper, connection, target):
+    _apply_registration_rollups(connection, target, {
+        'registrations': 1,
+        'attended': int(bool(target.attendance_confirmed)),
+        'certificates_issued': int(bool(target.certificate_issued))
+    }, day=(target.registration_date or datetime.utcnow()).date())
+
+@db.event.listens_for(Registration, 'after_update')
+def rollup_registration_progress(mapper, connection, target):
+    # Runs inside the same flush, so rollups commit or roll back with the registration
+    state = db.inspect(target)
+    deltas = {}
+    for attribute, counter in (('attendance_confirmed', 'attended'), ('certificate_issued', 'certificates_issued')):
+        history = state.attrs[attribute].history
+        if history.has_changes():
+            before = bool(history.deleted[0]) if history.deleted else False
+            after = bool(getattr(target, attribute))
+            if before != after:
+                deltas[counter] = 1 if after else -1
+    if deltas:
+        _apply_registration_rollups(connection, target, deltas)
+
+def rebuild_analytics_rollups():
+    """Recompute every rollup table from live and archived registrations."""
+    connection = db.session.connection()
+    for model in (EventDailyRegistrations, EventRegistrationStats, SegmentConversion):
+        connection.execute(db.delete(model))
+
+    for source in (Registration, RegistrationArchive):
+        counts = {
+            'registrations': db.func.count(source.id),
+            'attended': db.func.sum(db.case((source.attendance_confirmed == True, 1), else_=0)),
+            'certificates_issued': db.func.sum(db.case((source.certificate_issued == True, 1), else_=0)),
+        }
+        for row in connection.execute(db.select(source.event_id, *[c.label(n) for n, c in counts.items()])
+                                      .group_by(source.event_id)).mappings():
+            _increment_rollup(connection, EventRegistrationStats, {'event_id': row['event_id']},
+                              {name: row[name] for name in counts})
+
+        segment_columns = {'event_type': Event.event_type,
+                           'department': db.func.coalesce(User.department, UNSPECIFIED_DEPARTMENT)}
+        for dimension in ROLLUP_DIMENSIONS:
+            segment = segment_columns[dimension]
+            rows = connection.execute(
+                db.select(segment.label('value'), *[c.label(n) for n, c in counts.items()])
+                .select_from(source).join(Event, Event.id == source.event_id).join(User, User.id == source.user_id)
+                .group_by(segment)
+            ).mappings()
+            for row in rows:
+                _increment_rollup(connection, SegmentConversion, {'dimension': dimension, 'value': row['value']},
+                                  {name: row[name] for name in counts})
+
+        day = db.func.date(source.registration_date)
+        for event_id, registration_day, registrations in connection.execute(
+                db.select(source.event_id, day, db.func.count(source.id))
+                .where(source.registration_date != None).group_by(source.event_id, day)):
+            if isinstance(registration_day, str):  # SQLite returns DATE() as text
+                registration_day = date.fromisoformat(registration_day)
+            _increment_rollup(connection, EventDailyRegistrations,
+                              {'event_id': event_id, 'day': registration_day}, {'registrations': registrations})
+    db.session.commit()
+
+def init_db():
+    """Create missing tables, then add columns and indexes introduced since the database was created."""
+    db.create_all()
+    inspector = db.inspect(db.engine)
+    preparer = db.engine.dialect.identifier_preparer
+    with db.engine.begin() as connection:
+        for table in db.metadata.sorted_tables:
+            existing_columns = {column['name'] for column in inspector.get_columns(table.name)}
+            for column in table.columns:
+                if column.name not in existing_columns:
+                    column_ddl = CreateColumn(column).compile(dialect=db.engine.dialect)
+                    connection.exec_driver_sql(f'ALTER TABLE {preparer.format_table(table)} ADD COLUMN {column_ddl}')
+            for index in table.indexes:
+                index.create(connection, checkfirst=True)
+
+@app.cli.command('init-db')
+def init_db_command():
+    """Create or upgrade the database schema."""
+    init_db()
+    click.echo('Database initialized.')
+
+@app.cli.command('compile-templates')
+def compile_templates_command():
+    """Compile all templates into the on-disk bytecode cache."""
+    names = app.jinja_env.list_templates(extensions=['html'])
+    for name in names:
+        app.jinja_env.get_template(name)
+    click.echo(f'Compiled {len(names)} templates into {app.config["JINJA_CACHE_DIR"]}')
+
+# Event lifecycle scheduler
+# Every job selects due rows through the indexes above and records its progress in
+# the same transaction as its effects, so re-running after a crash never repeats work.
+app.config['SCHEDULER_INTERVAL'] = int(os.environ.get('SCHEDULER_INTERVAL', 60))  # seconds
+app.config['SCHEDULER_BATCH_SIZE'] = int(os.environ.get('SCHEDULER_BATCH_SIZE', 500))
+REMINDER_LEAD_TIME = timedelta(hours=24)
+
+def _update_events_in_batches(criteria, values):
+    # Short batches keep each SQLite write transaction (and its lock) brief
+    updated = 0
+    batch_size = app.config['SCHEDULER_BATCH_SIZE']
+    while True:
+        ids = db.session.scalars(db.select(Event.id).where(*criteria).limit(batch_size)).all()
+        if not ids:
+            return updated
+        db.session.execute(db.update(Event).where(Event.id.in_(ids))
+                           .values(version=Event.version + 1, **values))
+        db.session.commit()
+        updated += len(ids)
+
+def deactivate_finished_events(now):
+    return _update_events_in_batches(
+        [Event.is_active == True, Event.end_date < now],
+        {'is_active': False, 'registration_open': False})
+
+def close_expired_registrations(now):
+    return _update_events_in_batches(
+        [Event.registration_open == True, Event.registration_deadline < now],
+        {'registration_open': False})
+
+def send_start_reminders(now):
+    sent = 0
+    batch_size = app.config['SCHEDULER_BATCH_SIZE']
+    while True:
+        events = db.session.execute(
+            db.select(Event.id, Event.title)
+            .where(Event.is_active == True,
+                   Event.start_date > now,
+                   Event.start_date <= now + REMINDER_LEAD_TIME,
+                   Event.reminder_sent == False)
+            .order_by(Event.start_date)
+            .limit(batch_size)
+        ).all()
+        if not events:
+            return sent
+
+        titles = {event_id: title for event_id, title in events}
+        registrations = db.session.execute(
+            db.select(Registration.user_id, Registration.event_id)
+            .where(Registration.event_id.in_(titles), Registration.status != 'cancelled')
+        ).all()
+        notifications = [{
+            'user_id': user_id,
+            'title': 'Event Starting Soon',
+            'message': f'"{titles[event_id]}" starts within 24 hours',
+            'notification_type': 'event_reminder'
+        } for user_id, event_id in registrations]
+
+        if notifications:
+            db.session.execute(db.insert(Notification), notifications)
+        # reminder_sent does not affect rendering, so cached fragments stay valid
+        db.session.execute(db.update(Event).where(Event.id.in_(titles)).values(reminder_sent=True))
+        db.session.commit()
+        sent += len(notifications)
+
+def run_scheduled_jobs(now=None):
+    now = now or datetime.utcnow()
+    return {
+        'deactivated_events': deactivate_finished_events(now),
+        'closed_registrations': close_expired_registrations(now),
+        'reminders_sent': send_start_reminders(now),
+    }
+
+# Retention
+# Read notifications and registrations of long-finished events are moved into the
+# archive tables in small batches. Each batch copies and deletes in one short
+# transaction, so the job can be interrupted at any point and simply re-run.
+app.config['NOTIFICATION_RETENTION_DAYS'] = int(os.environ.get('NOTIFICATION_RETENTION_DAYS', 30))
+app.config['REGISTRATION_RETENTION_DAYS'] = int(os.environ.get('REGISTRATION_RETENTION_DAYS', 180))
+app.config['RETENTION_BATCH_SIZE'] = int(os.environ.get('RETENTION_BATCH_SIZE', 500))
+app.config['RETENTION_BATCH_PAUSE'] = float(os.environ.get('RETENTION_BATCH_PAUSE', 0.05))  # seconds between batches
+app.config['RETENTION_INTERVAL'] = int(os.environ.get('RETENTION_INTERVAL', 24 * 60 * 60))  # seconds between scheduler runs
+
+def _archive_in_batches(model, archive_model, criteria):
+    columns = [column.name for column in model.__table__.columns]
+    # SQLite hands out max(rowid) + 1 for new rows, so archiving the newest row
+    # would let its id be reused and collide with the archived copy.
+    max_id = db.session.scalar(db.select(db.func.max(model.id)))
+    moved = 0
+    while max_id is not None:
+        ids = db.session.scalars(
+            db.select(model.id).where(*criteria, model.id < max_id)
+            .order_by(model.id).limit(app.config['RETENTION_BATCH_SIZE'])
+        ).all()
+        if not ids:
+            break
+        db.session.execute(db.insert(archive_model).from_select(
+            columns, db.select(*[model.__table__.c[name] for name in columns]).where(model.id.in_(ids))))
+        db.session.execute(db.delete(model).where(model.id.in_(ids)))
+        db.session.commit()
+        moved += len(ids)
+        # Give request handlers a chance to take the SQLite write lock
+        time.sleep(app.config['RETENTION_BATCH_PAUSE'])
+    return moved
+
+def archive_read_notifications(now, days):
+    cutoff = now - timedelta(days=days)
+    return _archive_in_batches(Notification, NotificationArchive,
+                               [Notification.is_read == True, Notification.created_at < cutoff])
+
+def archive_finished_registrations(now, days):
+    # Only events the scheduler has already deactivated, which keeps the lookup on ix_event_active_end_date
+    cutoff = now - timedelta(days=days)
+    finished_events = db.select(Event.id).where(Event.is_active == False, Event.end_date < cutoff)
+    return _archive_in_batches(Registration, RegistrationArchive,
+                               [Registration.event_id.in_(finished_events)])
+
+def run_retention_jobs(now=None, notification_days=None, registration_days=None):
+    now = now or datetime.utcnow()
+    return {
+        'archived_notifications': archive_read_notifications(
+            now, notification_days or app.config['NOTIFICATION_RETENTION_DAYS']),
+        'archived_registrations': archive_finished_registrations(
+            now, registration_days or app.config['REGISTRATION_RETENTION_DAYS']),
+    }
+
+@app.cli.group('retention')
+def retention_cli():
+    """Archival and retention commands."""
+
+@retention_cli.command('run')
+@click.option('--notification-days', type=int, default=None, help='Archive read notifications older than this (default: NOTIFICATION_RETENTION_DAYS).')
+@click.option('--registration-days', type=int, default=None, help='Archive registrations of events that ended this long ago (default: REGISTRATION_RETENTION_DAYS).')
+def retention_run_command(notification_days, registration_days):
+    """Move old notifications and registrations into the archive tables."""
+    results = run_retention_jobs(notification_days=notification_days, registration_days=registration_days)
+    click.echo(f'Archived {results["archived_notifications"]} notifications and '
+               f'{results["archived_registrations"]} registrations.')
+
+@app.cli.group('analytics')
+def analytics_cli():
+    """Registration analytics commands."""
+
+@analytics_cli.command('rebuild')
+@click.option('--if-empty', is_flag=True, help='Only rebuild when no rollups exist yet.')
+def analytics_rebuild_command(if_empty):
+    """Recompute the analytics rollup tables from registrations."""
+    if if_empty and db.session.scalar(db.select(db.func.count()).select_from(EventRegistrationStats)):
+        click.echo('Analytics rollups already present, skipping rebuild.')
+        return
+    rebuild_analytics_rollups()
+    click.echo('Analytics rollups rebuilt.')
+
+@app.cli.group('scheduler')
+def scheduler_cli():
+    """Event lifecycle scheduler commands."""
+
+@scheduler_cli.command('run')
+@click.option('--once', is_flag=True, help='Run due jobs a single time and exit.')
+@click.option('--interval', type=int, default=None, help='Seconds between runs (default: SCHEDULER_INTERVAL).')
+def scheduler_run_command(once, interval):
+    """Deactivate finished events, close registrations and send reminders.
+
+    Retention (archiving old notifications and registrations) also runs on
+    start-up and then every RETENTION_INTERVAL seconds.
+    """
+    interval = interval or app.config['SCHEDULER_INTERVAL']
+    last_retention_run = None
+    while True:
+        try:
+            results = run_scheduled_jobs()
+            if last_retention_run is None or time.monotonic() - last_retention_run >= app.config['RETENTION_INTERVAL']:
+                # Archiving runs after lifecycle jobs so freshly deactivated events are eligible
+                results.update(run_retention_jobs())
+                last_retention_run = time.monotonic()
+            if any(results.values()):
+                click.echo(f'[{datetime.utcnow().isoformat()}] ' +
+                           ', '.join(f'{name}={count}' for name, count in results.items()))
+        except Exception as e:
+            db.session.rollback()
+            if once:
+                raise
+            app.logger.error(f'Scheduler run failed: {str(e)}')
+        if once:
+            break
+        time.sleep(interval)
 
 @login_manager.user_loader
 def load_user(user_id):
     return User.query.get(int(user_id))
 
+# Admission control
+# Token buckets per client IP and per user, plus a cap on concurrent requests per
+# endpoint. Both checks run before the view, so shed requests never reach the
+# database or the password hasher.
+app.config['RATELIMIT_STORAGE_URL'] = os.environ.get('RATELIMIT_STORAGE_URL')  # e.g. redis://localhost:6379/0
+app.config['RATELIMIT_LOGIN_PER_IP'] = os.environ.get('RATELIMIT_LOGIN_PER_IP', '30/minute')
+app.config['RATELIMIT_LOGIN_PER_IP_USER'] = os.environ.get('RATELIMIT_LOGIN_PER_IP_USER', '5/minute')
+# Looser than the per-(IP, user) bucket: it caps attacks spread over many IPs
+# without letting one client lock a real user out
+app.config['RATELIMIT_LOGIN_PER_USER'] = os.environ.get('RATELIMIT_LOGIN_PER_USER', '30/minute')
+app.config['RATELIMIT_REGISTER_PER_IP'] = os.environ.get('RATELIMIT_REGISTER_PER_IP', '60/minute')
+app.config['RATELIMIT_REGISTER_PER_USER'] = os.environ.get('RATELIMIT_REGISTER_PER_USER', '10/minute')
+# Must stay below the gunicorn --threads count (Procfile/render.yaml) to shed anything
+app.config['MAX_IN_FLIGHT_LOGIN'] = int(os.environ.get('MAX_IN_FLIGHT_LOGIN', 2))
+app.config['MAX_IN_FLIGHT_REGISTER'] = int(os.environ.get('MAX_IN_FLIGHT_REGISTER', 4))
+
+RATE_PERIODS = {'second': 1, 'minute': 60, 'hour': 3600}
+
+def parse_rate(rate):
+    """Turn '5/minute' into (capacity, tokens refilled per second)."""
+    count, period = rate.split('/')
+    return int(count), int(count) / RATE_PERIODS[period.strip()]
+
+class MemoryRateLimitBackend:
+    """Per-process buckets; limits are multiplied by the number of workers."""
+
+    def __init__(self, max_keys=100000):
+        self.max_keys = max_keys
+        self._buckets = OrderedDict()
+        self._lock = threading.Lock()
+
+    def consume(self, key, capacity, refill_rate):
+        now = time.monotonic()
+        with self._lock:
+            tokens, updated_at = self._buckets.get(key, (capacity, now))
+            tokens = min(capacity, tokens + (now - updated_at) * refill_rate)
+            allowed = tokens >= 1
+            if allowed:
+                tokens -= 1
+            self._buckets[key] = (tokens, now)
+            self._buckets.move_to_end(key)
+            while len(self._buckets) > self.max_keys:
+                self._buckets.popitem(last=False)
+        return allowed, 0 if allowed else (1 - tokens) / refill_rate
+
+class RedisRateLimitBackend:
+    """Buckets shared by every worker and instance through Redis."""
+
+    SCRIPT = """
+    local capacity = tonumber(ARGV[1])
+    local refill_rate = tonumber(ARGV[2])
+    local now = tonumber(ARGV[3])
+    local bucket = redis.call('HMGET', KEYS[1], 'tokens', 'updated_at')
+    local tokens = tonumber(bucket[1]) or capacity
+    local updated_at = tonumber(bucket[2]) or now
+    tokens = math.min(capacity, tokens + math.max(0, now - updated_at) * refill_rate)
+    local allowed = 0
+    if tokens >= 1 then
+        tokens = tokens - 1
+        allowed = 1
+    end
+    redis.call('HSET', KEYS[1], 'tokens', tostring(tokens), 'updated_at', tostring(now))
+    redis.call('EXPIRE', KEYS[1], math.ceil(capacity / refill_rate) + 1)
+    return {allowed, tostring(tokens)}
+    """
+
+    def __init__(self, url):
+        self._client = redis.Redis.from_url(url)
+        self._consume = self._client.register_script(self.SCRIPT)
+
+    def consume(self, key, capacity, refill_rate):
+        allowed, tokens = self._consume(keys=[f'ratelimit:{key}'], args=[capacity, refill_rate, time.time()])
+        return bool(allowed), 0 if allowed else (1 - float(tokens)) / refill_rate
+
+def create_rate_limit_backend(url):
+    if url and url.startswith('redis://'):
+        if REDIS_AVAILABLE:
+            return RedisRateLimitBackend(url)
+        app.logger.warning('RATELIMIT_STORAGE_URL is set but redis is not installed; using in-memory rate limits.')
+    return MemoryRateLimitBackend()
+
+rate_limit_backend = create_rate_limit_backend(app.config['RATELIMIT_STORAGE_URL'])
+admission_stats = {}
+_admission_stats_lock = threading.Lock()
+
+def _count_admission(endpoint, outcome):
+    with _admission_stats_lock:
+        counters = admission_stats.setdefault(endpoint, {})
+        counters[outcome] = counters.get(outcome, 0) + 1
+
+def _shed(endpoint, reason, retry_after):
+    _count_admission(endpoint, f'rejected_{reason}')
+    retry_after = max(1, math.ceil(retry_after))
+    # Rendered straight from the Jinja environment: render_template would run the
+    # context processors, and Flask-Login's loads the current user from the database
+    body = app.jinja_env.get_template('429.html').render(retry_after=retry_after)
+    response = app.response_class(body, status=429)
+    response.headers['Retry-After'] = str(retry_after)
+    return response
+
+def admission_control(buckets=(), max_in_flight=None, methods=('POST',)):
+    """Shed excess load with 429 before the view runs.
+
+    buckets is a sequence of (scope, config_key, key_func): config_key names the
+    app.config rate and key_func returns the identity to limit (or None to skip)
+    and must not touch the database. max_in_flight names the app.config cap.
+
+    The in-flight cap is a per-process semaphore, so it needs a worker that serves
+    requests concurrently; the Procfile and render.yaml run gunicorn with --threads.
+    """
+    def decorator(view):
+        endpoint = view.__name__
+        slots = threading.BoundedSemaphore(app.config[max_in_flight]) if max_in_flight else None
+
+        @wraps(view)
+        def wrapped(*args, **kwargs):
+            if request.method not in methods:
+                return view(*args, **kwargs)
+
+            for scope, config_key, key_func in buckets:
+                identity = key_func()
+                if not identity:
+                    continue
+                capacity, refill_rate = parse_rate(app.config[config_key])
+                allowed, retry_after = rate_limit_backend.consume(
+                    f'{endpoint}:{scope}:{identity}', capacity, refill_rate)
+                if not allowed:
+                    return _shed(endpoint, scope, retry_after)
+
+            if slots is not None and not slots.acquire(blocking=False):
+                return _shed(endpoint, 'in_flight', 1)
+            try:
+                _count_admission(endpoint, 'admitted')
+                return view(*args, **kwargs)
+            finally:
+                if slots is not None:
+                    slots.release()
+        return wrapped
+    return decorator
+
+def _client_ip():
+    return request.remote_addr
+
+def _login_username():
+    return request.form.get('username', '').strip().lower() or None
+
+def _login_attempt_key():
+    username = _login_username()
+    return f'{request.remote_addr}:{username}' if username else None
+
+def _session_user_id():
+    # Read straight from the session cookie so rejected requests skip the user loader query
+    return session.get('_user_id')
+
 # Routes
 @app.route('/')
 def index():
@@ -195,6 +965,10 @@ def register():
     return render_template('register.html')
 
 @app.route('/login', methods=['GET', 'POST'])
+@admission_control(buckets=[('ip', 'RATELIMIT_LOGIN_PER_IP', _client_ip),
+                            ('ip_user', 'RATELIMIT_LOGIN_PER_IP_USER', _login_attempt_key),
+                            ('user', 'RATELIMIT_LOGIN_PER_USER', _login_username)],
+                   max_in_flight='MAX_IN_FLIGHT_LOGIN')
 def login():
     if request.method == 'POST':
         username = request.form['username']
@@ -224,13 +998,17 @@ def dashboard():
     if current_user.role == 'admin':
         total_events = Event.query.count()
         total_users = User.query.count()
-        total_registrations = Registration.query.count()
+        total_registrations = db.session.scalar(
+            db.select(db.func.coalesce(db.func.sum(EventRegistrationStats.registrations), 0)))
         recent_events = Event.query.order_by(Event.created_at.desc()).limit(5).all()
         
         return render_template('admin_dashboard.html',
                              total_events=total_events,
                              total_users=total_users,
                              total_registrations=total_registrations,
+                             events_per_user=total_events / max(total_users, 1) * 100,
+                             registrations_per_event=total_registrations / max(total_events, 1),
+                             registrations_per_user=total_registrations / max(total_users, 1),
                              recent_events=recent_events)
     
     elif current_user.role == 'organizer':
@@ -239,10 +1017,15 @@ def dashboard():
             Event.start_date >= datetime.utcnow(),
             Event.creator_id == current_user.id
         ).order_by(Event.start_date).all()
+        total_participants = db.session.scalar(
+            db.select(db.func.coalesce(db.func.sum(EventRegistrationStats.registrations), 0))
+            .join(Event, Event.id == EventRegistrationStats.event_id)
+            .where(Event.creator_id == current_user.id))
         
         return render_template('organizer_dashboard.html',
                              my_events=my_events,
-                             upcoming_events=upcoming_events)
+                             upcoming_events=upcoming_events,
+                             total_participants=total_participants)
     
     else:  # student
         my_registrations = Registration.query.filter_by(user_id=current_user.id).all()
@@ -283,11 +1066,14 @@ def event_detail(event_id):
     return render_template('event_detail.html', event=event, is_registered=is_registered)
 
 @app.route('/event/register/<int:event_id>', methods=['POST'])
+@admission_control(buckets=[('ip', 'RATELIMIT_REGISTER_PER_IP', _client_ip),
+                            ('user', 'RATELIMIT_REGISTER_PER_USER', _session_user_id)],
+                   max_in_flight='MAX_IN_FLIGHT_REGISTER')
 @login_required
 def register_event(event_id):
     event = Event.query.get_or_404(event_id)
     
-    if event.registration_deadline and datetime.utcnow() > event.registration_deadline:
+    if not event.registration_open or (event.registration_deadline and datetime.utcnow() > event.registration_deadline):
         flash('Registration deadline has passed!', 'error')
         return redirect(url_for('event_detail', event_id=event_id))
     
@@ -483,10 +1269,14 @@ def issue_certificate(registration_id):
     
 
 
+def get_registration_or_archived_or_404(registration_id):
+    # Certificates stay available after the retention job archives a registration
+    return Registration.query.get(registration_id) or RegistrationArchive.query.get_or_404(registration_id)
+
 @app.route('/preview_certificate/<int:registration_id>')
 @login_required
 def preview_certificate(registration_id):
-    registration = Registration.query.get_or_404(registration_id)
+    registration = get_registration_or_archived_or_404(registration_id)
     
     if registration.user_id != current_user.id:
         flash('Unauthorized!', 'error')
@@ -512,7 +1302,7 @@ def preview_certificate(registration_id):
 @app.route('/download_certificate/<int:registration_id>')
 @login_required
 def download_certificate(registration_id):
-    registration = Registration.query.get_or_404(registration_id)
+    registration = get_registration_or_archived_or_404(registration_id)
     
     if registration.user_id != current_user.id:
         flash('Unauthorized!', 'error')
@@ -542,6 +1332,15 @@ def notifications():
     notifications = Notification.query.filter_by(user_id=current_user.id).order_by(Notification.created_at.desc()).all()
     return render_template('notifications.html', notifications=notifications)
 
+@app.route('/notifications/archive')
+@login_required
+def archived_notifications():
+    page = request.args.get('page', 1, type=int)
+    notifications = NotificationArchive.query.filter_by(user_id=current_user.id).order_by(
+        NotificationArchive.created_at.desc()).paginate(page=page, per_page=50, error_out=False)
+    return render_template('notifications.html', notifications=notifications.items,
+                           archived=True, pagination=notifications)
+
 @app.route('/mark_notification_read/<int:notification_id>', methods=['POST'])
 @login_required
 def mark_notification_read(notification_id):
@@ -559,7 +1358,22 @@ def mark_notification_read(notification_id):
 @app.route('/profile')
 @login_required
 def profile():
-    return render_template('profile.html')
+    page = request.args.get('history_page', 1, type=int)
+    history = RegistrationArchive.query.filter_by(user_id=current_user.id).options(
+        db.joinedload(RegistrationArchive.event)).order_by(
+        RegistrationArchive.registration_date.desc()).paginate(page=page, per_page=20, error_out=False)
+    # Totals come from aggregates so the activity summary does not need every archived row
+    archived_totals = db.session.execute(db.select(
+        db.func.count(RegistrationArchive.id),
+        db.func.coalesce(db.func.sum(db.case((RegistrationArchive.attendance_confirmed == True, 1), else_=0)), 0),
+        db.func.coalesce(db.func.sum(db.case((RegistrationArchive.certificate_issued == True, 1), else_=0)), 0)
+    ).where(RegistrationArchive.user_id == current_user.id)).one()
+    return render_template('profile.html',
+                           archived_registrations=history.items,
+                           history=history,
+                           archived_count=archived_totals[0],
+                           archived_attended=archived_totals[1],
+                           archived_certificates=archived_totals[2])
 
 @app.route('/edit_profile', methods=['GET', 'POST'])
 @login_required
@@ -597,15 +1411,75 @@ def api_event_stats(event_id):
     if current_user.role not in ['admin'] and event.creator_id != current_user.id:
         return jsonify({'error': 'Unauthorized'}), 403
     
-    registrations = Registration.query.filter_by(event_id=event_id).all()
-    attended = sum(1 for reg in registrations if reg.attendance_confirmed)
-    certificates_issued = sum(1 for reg in registrations if reg.certificate_issued)
+    stats = EventRegistrationStats.query.get(event_id) or EventRegistrationStats(
+        registrations=0, attended=0, certificates_issued=0)
+    
+    return jsonify({
+        'total_registrations': stats.registrations,
+        'attended': stats.attended,
+        'certificates_issued': stats.certificates_issued,
+        'attendance_rate': (stats.attended / stats.registrations * 100) if stats.registrations else 0
+    })
+
+@app.route('/api/analytics/events/<int:event_id>')
+@login_required
+def api_event_analytics(event_id):
+    event = Event.query.get_or_404(event_id)
+    
+    if current_user.role not in ['admin'] and event.creator_id != current_user.id:
+        return jsonify({'error': 'Unauthorized'}), 403
     
+    stats = EventRegistrationStats.query.get(event_id) or EventRegistrationStats(
+        registrations=0, attended=0, certificates_issued=0)
+    daily = EventDailyRegistrations.query.filter_by(event_id=event_id).order_by(EventDailyRegistrations.day).all()
+    
+    return jsonify({
+        'event_id': event_id,
+        'registrations': stats.registrations,
+        'attended': stats.attended,
+        'certificates_issued': stats.certificates_issued,
+        'attendance_rate': (stats.attended / stats.registrations * 100) if stats.registrations else 0,
+        'certificate_rate': (stats.certificates_issued / stats.registrations * 100) if stats.registrations else 0,
+        'registrations_per_day': [{'day': row.day.isoformat(), 'registrations': row.registrations} for row in daily]
+    })
+
+@app.route('/api/analytics/conversion')
+@login_required
+def api_conversion_analytics():
+    if current_user.role != 'admin':
+        return jsonify({'error': 'Unauthorized'}), 403
+    
+    dimension = request.args.get('dimension', 'event_type')
+    if dimension not in ROLLUP_DIMENSIONS:
+        return jsonify({'error': f'dimension must be one of {", ".join(ROLLUP_DIMENSIONS)}'}), 400
+    
+    segments = SegmentConversion.query.filter_by(dimension=dimension).order_by(
+        SegmentConversion.registrations.desc()).all()
+    return jsonify({
+        'dimension': dimension,
+        'segments': [{
+            'value': segment.value,
+            'registrations': segment.registrations,
+            'attended': segment.attended,
+            'certificates_issued': segment.certificates_issued,
+            'attendance_rate': (segment.attended / segment.registrations * 100) if segment.registrations else 0,
+            'certificate_rate': (segment.certificates_issued / segment.registrations * 100) if segment.registrations else 0
+        } for segment in segments]
+    })
+
+@app.route('/api/admission_stats')
+@login_required
+def api_admission_stats():
+    if current_user.role != 'admin':
+        return jsonify({'error': 'Unauthorized'}), 403
+
+    # Counters are per worker process; sum them across workers to size capacity
+    with _admission_stats_lock:
+        endpoints = {endpoint: dict(counters) for endpoint, counters in admission_stats.items()}
     return jsonify({
-        'total_registrations': len(registrations),
-        'attended': attended,
-        'certificates_issued': certificates_issued,
-        'attendance_rate': (attended / len(registrations) * 100) if registrations else 0
+        'pid': os.getpid(),
+        'backend': type(rate_limit_backend).__name__,
+        'endpoints': endpoints
     })
 
 # Error handlers
@@ -632,7 +1506,7 @@ def handle_exception(e):
 
 if __name__ == '__main__':
     with app.app_context():
-        db.create_all()
+        init_db()
     
     # Get port from environment variable (for Heroku) or use 5000 for local development
     port = int(os.environ.get('PORT', 5000))
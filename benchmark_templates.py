@@ -0,0 +1,82 @@
+#!/usr/bin/env python3
+"""
+Render-time benchmark for the heavy event templates
+Compares full renders against renders served from the fragment cache
+"""
+
+import os
+import sys
+import time
+from datetime import datetime, timedelta
+
+# Use a throwaway in-memory database so the benchmark never touches real data
+os.environ.setdefault('DATABASE_URL', 'sqlite://')
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from app import app, db, init_db, fragment_cache, FragmentCacheExtension, User, Event
+
+ROUNDS = 200
+
+def seed_events(count=9):
+    organizer = User(username='bench', email='bench@example.com', password_hash='x',
+                     full_name='Bench Organizer', role='organizer', department='CSE')
+    db.session.add(organizer)
+    db.session.flush()
+    start = datetime.utcnow() + timedelta(days=7)
+    for i in range(count):
+        db.session.add(Event(
+            title=f'Benchmark Event {i}',
+            description='A long description for the benchmark event. ' * 10,
+            event_type='seminar',
+            start_date=start + timedelta(days=i),
+            end_date=start + timedelta(days=i, hours=3),
+            venue='Main Auditorium',
+            max_participants=100,
+            current_participants=i,
+            registration_deadline=start + timedelta(days=i - 1),
+            creator_id=organizer.id
+        ))
+    db.session.commit()
+
+def time_requests(client, path, clear_cache):
+    timings = []
+    for _ in range(ROUNDS):
+        if clear_cache:
+            fragment_cache.clear()
+        started = time.perf_counter()
+        response = client.get(path)
+        timings.append(time.perf_counter() - started)
+        assert response.status_code == 200, f'{path} returned {response.status_code}'
+    timings.sort()
+    return timings[len(timings) // 2] * 1000
+
+def time_template_compile(use_bytecode_cache):
+    # A fresh environment behaves like a newly booted worker
+    env = app.create_jinja_environment()
+    env.add_extension(FragmentCacheExtension)
+    env.bytecode_cache = app.jinja_env.bytecode_cache if use_bytecode_cache else None
+    started = time.perf_counter()
+    for name in env.list_templates(extensions=['html']):
+        env.get_template(name)
+    return (time.perf_counter() - started) * 1000
+
+def main():
+    with app.app_context():
+        init_db()
+        seed_events()
+        event_id = Event.query.first().id
+
+    client = app.test_client()
+    print("EventHub - Template Render Benchmark")
+    print(f"Median of {ROUNDS} requests per page")
+    print("=" * 50)
+    time_template_compile(use_bytecode_cache=True)  # make sure the bytecode cache is warm
+    print(f"Template load at boot  compile: {time_template_compile(False):6.2f} ms   "
+          f"bytecode cache: {time_template_compile(True):6.2f} ms")
+    for path in ['/', '/events', f'/event/{event_id}']:
+        uncached = time_requests(client, path, clear_cache=True)
+        cached = time_requests(client, path, clear_cache=False)
+        print(f"{path:<12} full render: {uncached:6.2f} ms   fragment cache: {cached:6.2f} ms")
+
+if __name__ == "__main__":
+    main()
@@ -23,6 +23,7 @@ pip install gunicorn==21.2.0
 pip install email-validator==2.1.0
 pip install bcrypt==4.1.2
 pip install reportlab==4.0.7
+pip install Brotli==1.1.0
 
 # Try to install Pillow with latest version for Python 3.13 compatibility
 echo "🖼️ Installing Pillow..."
@@ -42,13 +43,25 @@ fi
 # Create uploads directory if it doesn't exist
 mkdir -p uploads
 
+echo "🎨 Building static assets..."
+# Minify, fingerprint and precompress CSS/JS into static/dist
+flask --app app assets build
+
+echo "🧩 Compiling templates..."
+# Warm the Jinja bytecode cache so workers skip template compilation at boot
+flask --app app compile-templates
+
 echo "🗄️ Initializing database..."
 # Initialize database if it doesn't exist
 python -c "
-from app import app, db
+from app import app, init_db
 with app.app_context():
-    db.create_all()
+    init_db()
     print('✅ Database initialized successfully!')
 "
 
+echo "📊 Preparing analytics rollups..."
+# Backfill rollup tables on first deploy; later deploys skip this
+flask --app app analytics rebuild --if-empty
+
 echo "✅ Build completed successfully!"
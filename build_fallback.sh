@@ -30,9 +30,9 @@ mkdir -p uploads
 echo "🗄️ Initializing database..."
 # Initialize database if it doesn't exist
 python -c "
-from app import app, db
+from app import app, init_db
 with app.app_context():
-    db.create_all()
+    init_db()
     print('✅ Database initialized successfully!')
 "
 
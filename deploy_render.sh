@@ -44,7 +44,7 @@ echo "   6. Use these settings:"
 echo "      - Name: college-event-system"
 echo "      - Environment: Python"
 echo "      - Build Command: ./build.sh"
-echo "      - Start Command: gunicorn app:app"
+echo "      - Start Command: gunicorn --threads 8 app:app"
 echo "      - Plan: Free"
 echo "   7. Click 'Create Web Service'"
 echo ""
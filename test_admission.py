@@ -0,0 +1,104 @@
+#!/usr/bin/env python3
+"""
+Test script for admission control
+Checks that shed requests get 429 without touching the database
+"""
+
+import os
+import sys
+import threading
+import time
+
+# Use a throwaway in-memory database so the test never touches real data
+os.environ.setdefault('DATABASE_URL', 'sqlite://')
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from sqlalchemy import event as sqlalchemy_event
+
+import app as eventhub
+from app import app, db, init_db, User, Event
+from datetime import datetime, timedelta
+
+def setup_data():
+    with app.app_context():
+        init_db()
+        existing = User.query.filter_by(username='student').first()
+        if existing:
+            return existing.id, Event.query.first().id
+        student = User(username='student', email='student@example.com', password_hash='x',
+                       full_name='Test Student', role='student')
+        db.session.add(student)
+        db.session.flush()
+        event = Event(title='Fest', description='Test fest', event_type='fest',
+                      start_date=datetime.utcnow() + timedelta(days=7),
+                      end_date=datetime.utcnow() + timedelta(days=8),
+                      max_participants=1000, creator_id=student.id)
+        db.session.add(event)
+        db.session.commit()
+        return student.id, event.id
+
+def count_queries(func):
+    statements = []
+    def record(conn, cursor, statement, *args):
+        statements.append(statement)
+    with app.app_context():
+        engine = db.engine
+    sqlalchemy_event.listen(engine, 'before_cursor_execute', record)
+    try:
+        result = func()
+    finally:
+        sqlalchemy_event.remove(engine, 'before_cursor_execute', record)
+    return result, statements
+
+def test_shed_registration_runs_no_queries():
+    user_id, event_id = setup_data()
+    client = app.test_client()
+    with client.session_transaction() as sess:
+        sess['_user_id'] = str(user_id)
+        sess['_fresh'] = True
+
+    capacity, _ = eventhub.parse_rate(app.config['RATELIMIT_REGISTER_PER_USER'])
+    for _ in range(capacity):
+        client.post(f'/event/register/{event_id}')
+
+    response, statements = count_queries(lambda: client.post(f'/event/register/{event_id}'))
+    assert response.status_code == 429, response.status_code
+    assert 'Retry-After' in response.headers
+    assert statements == [], statements
+    print("✅ Shed registration returned 429 without any database query")
+
+def test_login_username_bucket_spans_ips():
+    client = app.test_client()
+    capacity, _ = eventhub.parse_rate(app.config['RATELIMIT_LOGIN_PER_USER'])
+    codes = [client.post('/login', data={'username': 'target', 'password': 'x'},
+                         headers={'X-Forwarded-For': f'10.1.{i // 250}.{i % 250}'}).status_code
+             for i in range(capacity + 5)]
+    assert codes.count(429) == 5, codes
+    print("✅ Per-username login bucket limits attempts spread across many IPs")
+
+def test_in_flight_cap_sheds_concurrent_logins():
+    setup_data()
+    original_check = eventhub.check_password_hash
+    eventhub.check_password_hash = lambda *args: time.sleep(0.3) or False
+    codes = []
+    def attempt(i):
+        # An existing username, so every admitted request reaches the (slowed) hasher
+        response = app.test_client().post('/login', data={'username': 'student', 'password': 'x'},
+                                          headers={'X-Forwarded-For': f'10.2.0.{i}'})
+        codes.append(response.status_code)
+    try:
+        threads = [threading.Thread(target=attempt, args=(i,)) for i in range(6)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+    finally:
+        eventhub.check_password_hash = original_check
+    assert codes.count(429) == 6 - app.config['MAX_IN_FLIGHT_LOGIN'], codes
+    print("✅ In-flight cap shed concurrent logins above MAX_IN_FLIGHT_LOGIN")
+
+if __name__ == "__main__":
+    test_shed_registration_runs_no_queries()
+    test_login_username_bucket_spans_ips()
+    test_in_flight_cap_sheds_concurrent_logins()
+    print("\n🎉 Admission control checks passed!")